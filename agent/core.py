@@ -9,10 +9,11 @@ import os
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 from langgraph.checkpoint.memory import MemorySaver
 
 from agent.state import AgentState
@@ -30,19 +31,8 @@ class PersonalAssistant:
     4. Uses skill instructions to help the user
     """
     
-    SYSTEM_PROMPT = """You are a helpful personal assistant.
-
-## Current Time
-{current_time}
-
-## Available Skills
-You have access to these skills that can be activated when needed:
-{available_skills}
-
-## Active Skills
-{active_skills_section}
-
-## Your Capabilities
+    # Sections shared by the main prompt and the fan-out branch prompt
+    GUIDELINES = """## Your Capabilities
 
 ### Data Operations
 You can read and write JSON files in the `data/` directory to persist information:
@@ -57,7 +47,21 @@ When a skill instructs you to store data, use Python-style JSON operations menta
 2. **Follow the instructions from active skills** to help them
 3. **Be conversational and friendly** in your responses
 4. **Use emojis** to make responses more engaging
-5. **Persist important data** when skills instruct you to
+5. **Persist important data** when skills instruct you to"""
+
+    SYSTEM_PROMPT = """You are a helpful personal assistant.
+
+## Current Time
+{current_time}
+
+## Available Skills
+You have access to these skills that can be activated when needed:
+{available_skills}
+
+## Active Skills
+{active_skills_section}
+
+{guidelines}
 
 ## Important
 - Follow skill instructions exactly as written
@@ -65,17 +69,54 @@ When a skill instructs you to store data, use Python-style JSON operations menta
 - Be helpful, concise, and accurate
 """
 
-    def __init__(self, skills_dir: str = "skills"):
+    BRANCH_PROMPT = """You are a helpful personal assistant.
+
+## Current Time
+{current_time}
+
+## Your Part of the Message
+The user's message may contain several requests, and other assistants are
+answering the rest. {branch_scope}
+
+{skill_content}
+
+{guidelines}
+
+## Important
+- Follow the skill instructions exactly as written
+- Be helpful, concise, and accurate
+- Do not answer or mention requests outside your part of the message
+- If no part of the message is yours, reply with exactly: {no_match}
+"""
+
+    BRANCH_SKILL_SCOPE = "Handle ONLY the part that the following skill covers:"
+
+    BRANCH_LEFTOVER_SCOPE = (
+        "These skills are already being handled elsewhere: {handled_skills}. "
+        "Handle every OTHER part of the message, such as greetings, small talk, "
+        "time questions, or anything no skill covers:"
+    )
+
+    # Reply a fan-out branch gives when the message has nothing for it
+    BRANCH_NO_MATCH = "NONE"
+
+    # Fallback skill; in fan-out mode its branch also answers leftover requests
+    FALLBACK_SKILL = "chat"
+
+    def __init__(self, skills_dir: str = "skills", fan_out: bool = False):
         """
         Initialize the personal assistant.
         
         Args:
             skills_dir: Path to the skills directory
+            fan_out: Run each matched skill as its own parallel branch when
+                a message hits several skills
         """
         self.skill_loader = SkillLoader(skills_dir)
         self.memory = MemorySaver()
         self.data_dir = Path("data")
         self.data_dir.mkdir(exist_ok=True)
+        self.fan_out = fan_out
         
         # Initialize LLM
         self.llm = ChatGroq(
@@ -87,16 +128,28 @@ When a skill instructs you to store data, use Python-style JSON operations menta
         self._build_graph()
     
     def _build_graph(self) -> None:
-        """Build the LangGraph workflow."""
+        """
+        Build the LangGraph workflow.
+        
+        In fan-out mode, messages matching several skills are routed to one
+        "skill" branch per skill. LangGraph runs these branches concurrently
+        in the same step, and the "merge" node combines their responses.
+        """
         graph = StateGraph(AgentState)
         
-        # Single node that handles the conversation
+        # Agent node that handles the conversation with all active skills
         graph.add_node("agent", self._agent_node)
-        
-        # Set entry point and edge to end
-        graph.set_entry_point("agent")
         graph.add_edge("agent", END)
         
+        if self.fan_out:
+            graph.add_node("skill", self._skill_branch_node)
+            graph.add_node("merge", self._merge_node)
+            graph.add_conditional_edges(START, self._route_skills, ["agent", "skill"])
+            graph.add_edge("skill", "merge")
+            graph.add_edge("merge", END)
+        else:
+            graph.set_entry_point("agent")
+        
         # Compile with memory
         self.graph = graph.compile(checkpointer=self.memory)
     
@@ -121,7 +174,8 @@ When a skill instructs you to store data, use Python-style JSON operations menta
         return self.SYSTEM_PROMPT.format(
             current_time=current_time,
             available_skills=available_skills,
-            active_skills_section=active_skills_section
+            active_skills_section=active_skills_section,
+            guidelines=self.GUIDELINES
         )
     
     def _agent_node(self, state: AgentState) -> Dict[str, Any]:
@@ -137,6 +191,100 @@ When a skill instructs you to store data, use Python-style JSON operations menta
         
         return {"messages": [response]}
     
+    def _get_fan_out_skills(self, state: AgentState) -> List[str]:
+        """Get the matched skills, other than the fallback, that get a branch."""
+        return [
+            skill_name for skill_name in state.get("matched_skills") or []
+            if skill_name != self.FALLBACK_SKILL
+        ]
+    
+    def _route_skills(self, state: AgentState) -> Union[str, List[Send]]:
+        """
+        Route to the single agent node, or fan out one branch per matched skill.
+        
+        Messages matching fewer than two non-fallback skills go to the agent
+        node. Otherwise a fallback branch runs alongside the skill branches
+        to answer greetings and any request no matched skill covers.
+        """
+        fan_out_skills = self._get_fan_out_skills(state)
+        if len(fan_out_skills) < 2:
+            return "agent"
+        
+        sends = [
+            Send("skill", {
+                "skill": self.FALLBACK_SKILL,
+                "messages": state["messages"],
+                "handled_skills": fan_out_skills
+            })
+        ]
+        sends.extend(
+            Send("skill", {"skill": skill_name, "messages": state["messages"]})
+            for skill_name in fan_out_skills
+        )
+        return sends
+    
+    def _skill_branch_node(self, branch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fan-out branch that answers using only its own skill's instructions.
+        
+        The fallback branch also answers every part of the message that the
+        other branches' skills (``handled_skills``) do not cover.
+        """
+        skill_name = branch["skill"]
+        # chat() has already activated matched skills; only read here so
+        # parallel branches never modify shared loader state
+        skill_content = self.skill_loader.active_skills.get(skill_name, "")
+        if skill_content:
+            skill_content = f"<active_skill name=\"{skill_name}\">\n{skill_content}\n</active_skill>"
+        
+        if "handled_skills" in branch:
+            branch_scope = self.BRANCH_LEFTOVER_SCOPE.format(
+                handled_skills=", ".join(branch["handled_skills"])
+            )
+        else:
+            branch_scope = self.BRANCH_SKILL_SCOPE
+        
+        system_msg = SystemMessage(content=self.BRANCH_PROMPT.format(
+            current_time=datetime.now().strftime("%A, %B %d, %Y at %I:%M %p"),
+            branch_scope=branch_scope,
+            skill_content=skill_content,
+            guidelines=self.GUIDELINES,
+            no_match=self.BRANCH_NO_MATCH
+        ))
+        messages = [system_msg] + branch["messages"]
+        
+        response = self.llm.invoke(messages)
+        
+        # Content may be a list of content blocks rather than a string
+        content = response.content
+        if not isinstance(content, str):
+            content = "".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        
+        return {"skill_results": {skill_name: content}}
+    
+    def _merge_node(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Combine the fan-out branch responses, fallback first, then the other
+        skills in the order they were matched.
+        
+        Branches that found nothing for them are dropped. If every branch
+        declined, the agent node answers with all active skills.
+        """
+        results = state.get("skill_results") or {}
+        parts = []
+        for skill_name in [self.FALLBACK_SKILL] + self._get_fan_out_skills(state):
+            reply = results.get(skill_name, "").strip()
+            if reply and reply.strip(" .").upper() != self.BRANCH_NO_MATCH:
+                parts.append(reply)
+        
+        if not parts:
+            return self._agent_node(state)
+        
+        return {"messages": [AIMessage(content="\n\n".join(parts))]}
+    
     def _determine_skills_needed(self, message: str) -> List[str]:
         """
         Analyze the message to determine which skills should be active.
@@ -208,7 +356,9 @@ When a skill instructs you to store data, use Python-style JSON operations menta
         initial_state = {
             "messages": [HumanMessage(content=message)],
             "active_skills": self.skill_loader.list_active(),
-            "skill_instructions": self.skill_loader.get_active_skills_content()
+            "skill_instructions": self.skill_loader.get_active_skills_content(),
+            "matched_skills": needed_skills,
+            "skill_results": None  # reset results from the previous turn
         }
         
         config = {"configurable": {"thread_id": thread_id}}
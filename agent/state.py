@@ -4,10 +4,24 @@ Agent State
 TypedDict definition for the LangGraph agent state.
 """
 
-from typing import Dict, List, Any, TypedDict
+from typing import Annotated, Dict, List, Any, Optional, TypedDict
 from langchain_core.messages import BaseMessage
 
 
+def merge_skill_results(
+    existing: Dict[str, str], new: Optional[Dict[str, str]]
+) -> Dict[str, str]:
+    """
+    Reducer for per-skill branch results.
+    
+    Parallel branches each write their own key, so the updates are merged.
+    Passing None resets the results at the start of a new turn.
+    """
+    if new is None:
+        return {}
+    return {**(existing or {}), **new}
+
+
 class AgentState(TypedDict):
     """
     State maintained throughout the agent's execution.
@@ -16,7 +30,11 @@ class AgentState(TypedDict):
         messages: Conversation history
         active_skills: Names of currently active skills
         skill_instructions: Combined instructions from active skills
+        matched_skills: Skills matched for the current message
+        skill_results: Responses from fan-out branches (skill name -> text)
     """
     messages: List[BaseMessage]
     active_skills: List[str]
     skill_instructions: str
+    matched_skills: List[str]
+    skill_results: Annotated[Dict[str, str], merge_skill_results]
@@ -87,7 +87,9 @@ def main():
     print("🔧 Initializing skill-based assistant...")
     print("-" * 50)
     
-    assistant = PersonalAssistant(skills_dir="skills")
+    # Opt-in parallel fan-out for messages that match several skills
+    fan_out = os.getenv("ASSISTANT_FAN_OUT", "").lower() in ("1", "true", "yes")
+    assistant = PersonalAssistant(skills_dir="skills", fan_out=fan_out)
     
     print("-" * 50)
     print("\n✨ Ready! Skills are loaded automatically based on your messages.\n")